@@ -1,6 +1,6 @@
 from dotenv import load_dotenv
 
-from .loader import load_yaml_config
+from .loader import get_search_config, load_yaml_config
 from .questions import BUILT_IN_QUESTIONS, BUILT_IN_QUESTIONS_ZH_CN
 from .tools import SearchEngine, SELECTED_SEARCH_ENGINE
 from .agents import AGENT_LLM_MAP
@@ -35,6 +35,7 @@ TEAM_MEMBERS = list(TEAM_MEMBER_CONFIGURATIONS.keys())
 
 __all__ = [
     load_yaml_config,
+    "get_search_config",
     "SearchEngine",
     "SELECTED_SEARCH_ENGINE",
     "BUILT_IN_QUESTIONS",
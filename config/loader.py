@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from typing import Dict, Any
 import yaml
 
@@ -66,4 +67,9 @@ def load_yaml_config(file_path: str) ->Dict[str,Any]:
 
     _config_cache[file_path] = processed_config
     return processed_config
-    
+
+
+@lru_cache(maxsize=1)
+def get_search_config() -> Dict[str, Any]:
+    '''get the SEARCH_ENGINE section of conf.yaml, cached; use get_search_config.cache_clear() to reset'''
+    return load_yaml_config("conf.yaml").get("SEARCH_ENGINE", {})
@@ -4,8 +4,17 @@
 import re
 from urllib.parse import urljoin
 
+from bs4 import BeautifulSoup, NavigableString, Tag
+from markdownify import MarkdownConverter
 from markdownify import markdownify as md
 
+# Containers that readability wraps around the article body; they render to
+# nothing in markdown, so incremental conversion can descend through them.
+_WRAPPER_TAGS = {"html", "body", "div", "article", "section", "main"}
+
+# Top-level blocks converted on the first attempt; doubled until max_chars is covered
+_INITIAL_PREFIX_BLOCKS = 8
+
 
 class Article:
     url: str
@@ -14,17 +23,63 @@ class Article:
         self.title = title
         self.html_content = html_content
 
-    def to_markdown(self, including_title: bool = True) -> str:
+    def to_markdown(
+        self, including_title: bool = True, max_chars: int | None = None
+    ) -> str:
         markdown = ""
         if including_title:
             markdown += f"# {self.title}\n\n"
         
         if self.html_content is None or not str(self.html_content).strip():
             markdown += "*No content available*\n"
-        else:
+        elif max_chars is None:
             markdown += md(self.html_content)
+        else:
+            markdown += self._to_markdown_prefix(max_chars - len(markdown))
         
-        return markdown
+        return markdown if max_chars is None else markdown[:max_chars]
+
+    def _to_markdown_prefix(self, max_chars: int) -> str:
+        """Convert only as many top-level blocks as needed to cover max_chars.
+
+        The document is parsed once and converted as a whole with the
+        trailing blocks hidden, so every kept node is rendered in its real
+        context and the result is a prefix of the full conversion.
+        """
+        if max_chars <= 0:
+            return ""
+
+        soup = BeautifulSoup(str(self.html_content), "html.parser")
+        container = soup
+        while True:
+            content = [
+                child
+                for child in container.children
+                if not (isinstance(child, NavigableString) and not child.strip())
+            ]
+            if (
+                len(content) == 1
+                and isinstance(content[0], Tag)
+                and content[0].name in _WRAPPER_TAGS
+            ):
+                container = content[0]
+            else:
+                break
+
+        converter = MarkdownConverter()
+        blocks = container.contents
+        kept = _INITIAL_PREFIX_BLOCKS
+        while kept < len(blocks):
+            # Hide the trailing blocks from the converter. Sibling links are
+            # left intact, so the kept blocks render exactly as they do in the
+            # full document, and only trailing whitespace can differ
+            container.contents = blocks[:kept]
+            markdown = converter.convert_soup(soup)
+            if len(markdown.rstrip()) >= max_chars:
+                return markdown[:max_chars]
+            kept *= 2
+        container.contents = blocks
+        return converter.convert_soup(soup)[:max_chars]
 
     def to_message(self) -> list[dict]:
         image_pattern = r"!\[.*?\]\((.*?)\)"
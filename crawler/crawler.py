@@ -135,6 +135,12 @@ def is_html_content(content: str) -> bool:
 
 
 class Crawler:
+    def __init__(self):
+        # The engine client is kept between crawls so its HTTP session (and
+        # connection pool) is reused; it is rebuilt if the config changes.
+        self._crawler_client = None
+        self._crawler_config = None
+
     def crawl(self, url: str) -> Article:
         # To help LLMs better understand content, we extract clean
         # articles from HTML, convert them to markdown, and split
@@ -154,7 +160,10 @@ class Crawler:
         crawler_config = config.get("CRAWLER_ENGINE", {})
         
         # Get the selected crawler tool based on configuration
-        crawler_client = self._select_crawler_tool(crawler_config)
+        if self._crawler_client is None or crawler_config != self._crawler_config:
+            self._crawler_client = self._select_crawler_tool(crawler_config)
+            self._crawler_config = crawler_config
+        crawler_client = self._crawler_client
         html = self._crawl_with_tool(crawler_client, url)
         
         # Check if we got valid HTML content
@@ -30,6 +30,8 @@ class InfoQuestClient:
         self.timeout = timeout
         self.navi_timeout = navi_timeout
         self.api_key_set = bool(os.getenv("INFOQUEST_API_KEY"))
+        # Reuse one keep-alive connection pool across crawls
+        self._session = requests.Session()
         
         config_details = (
             f"\n📋 Configuration Details:\n"
@@ -60,7 +62,7 @@ class InfoQuestClient:
         
         logger.debug("Sending crawl request to InfoQuest API")
         try:
-            response = requests.post(
+            response = self._session.post(
                 "https://reader.infoquest.bytepluses.com",
                 headers=headers,
                 json=data
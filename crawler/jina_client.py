@@ -10,6 +10,10 @@ logger = logging.getLogger(__name__)
 
 
 class JinaClient:
+    def __init__(self):
+        # Reuse one keep-alive connection pool across crawls
+        self._session = requests.Session()
+
     def crawl(self, url: str, return_format: str = "html") -> str:
         headers = {
             "Content-Type": "application/json",
@@ -23,7 +27,7 @@ class JinaClient:
             )
         data = {"url": url}
         try:
-            response = requests.post("https://r.jina.ai/", headers=headers, json=data)
+            response = self._session.post("https://r.jina.ai/", headers=headers, json=data)
             
             if response.status_code != 200:
                 error_message = f"Jina API returned status {response.status_code}: {response.text}"
@@ -2,22 +2,36 @@
 # SPDX-License-Identifier: MIT
 
 import asyncio
+import base64
 import hashlib
+import itertools
 import logging
+import os
+import re
+import threading
 import uuid
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Sequence, Set
 
 from langchain_openai import OpenAIEmbeddings
 from langchain_qdrant import QdrantVectorStore
 from openai import OpenAI
-from qdrant_client import QdrantClient, grpc
+from qdrant_client import AsyncQdrantClient, QdrantClient, grpc
 from qdrant_client.models import (
+    Batch,
     Distance,
     FieldCondition,
     Filter,
     MatchValue,
-    PointStruct,
+    PayloadSchemaType,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
     VectorParams,
 )
 
@@ -27,6 +41,19 @@ from rag.retriever import Chunk, Document, Resource, Retriever
 logger = logging.getLogger(__name__)
 
 SCROLL_SIZE = 64
+MAX_READ_WORKERS = 16
+# Query embeddings kept for repeated searches, stored as float32 arrays
+# (8 MiB at 2048 dimensions).
+EMBEDDING_CACHE_SIZE = 1024
+_UUID_NAMESPACE_BYTES = uuid.NAMESPACE_DNS.bytes
+# First "# " heading, allowing leading whitespace and ignoring empty headings.
+_TITLE_RE = re.compile(r"^[^\S\n]*# (.*\S)", re.MULTILINE)
+
+# Shortlist on the int8 vectors, then rescore the candidates with the
+# original float32 vectors.
+QUANTIZED_SEARCH_PARAMS = SearchParams(
+    quantization=QuantizationSearchParams(rescore=True, oversampling=2.0)
+)
 
 
 class DashscopeEmbeddings:
@@ -46,6 +73,11 @@ class DashscopeEmbeddings:
             input=clean_texts,
             encoding_format=self._encoding_format,
         )
+        if self._encoding_format == "base64":
+            # Packed little-endian float32, about a quarter of the JSON size.
+            return [
+                array("f", base64.b64decode(d.embedding)).tolist() for d in resp.data
+            ]
         return [d.embedding for d in resp.data]
 
     def embed_query(self, text: str) -> List[float]:
@@ -72,14 +104,20 @@ class QdrantProvider(Retriever):
             self.embedding_model_name
         )
         self.embedding_provider = get_str_env("QDRANT_EMBEDDING_PROVIDER", "openai")
+        self.embedding_encoding_format = get_str_env(
+            "QDRANT_EMBEDDING_ENCODING_FORMAT", "float"
+        )
 
         self.auto_load_examples: bool = get_bool_env("QDRANT_AUTO_LOAD_EXAMPLES", True)
         self.examples_dir: str = get_str_env("QDRANT_EXAMPLES_DIR", "examples")
         self.chunk_size: int = get_int_env("QDRANT_CHUNK_SIZE", 4000)
 
         self._init_embedding_model()
+        self._embedding_cache: OrderedDict[str, array] = OrderedDict()
+        self._embedding_cache_lock = threading.Lock()
 
         self.client: Any = None
+        self.aclient: Any = None
         self.vector_store: Any = None
 
     def _init_embedding_model(self) -> None:
@@ -93,6 +131,7 @@ class QdrantProvider(Retriever):
         if self.embedding_provider.lower() == "openai":
             self.embedding_model = OpenAIEmbeddings(**kwargs)
         elif self.embedding_provider.lower() == "dashscope":
+            kwargs["encoding_format"] = self.embedding_encoding_format
             self.embedding_model = DashscopeEmbeddings(**kwargs)
         else:
             raise ValueError(
@@ -118,6 +157,18 @@ class QdrantProvider(Retriever):
                 vectors_config=VectorParams(
                     size=self.embedding_dim, distance=Distance.COSINE
                 ),
+                quantization_config=ScalarQuantization(
+                    scalar=ScalarQuantizationConfig(
+                        type=ScalarType.INT8, always_ram=True
+                    )
+                ),
+            )
+            # Every scroll filters on source; points are looked up by id, so
+            # no other payload field needs an index.
+            self.client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name="source",
+                field_schema=PayloadSchemaType.KEYWORD,
             )
             logger.info("Created Qdrant collection: %s", self.collection_name)
 
@@ -132,34 +183,45 @@ class QdrantProvider(Retriever):
 
         logger.info("Loading example files from: %s", examples_path)
 
-        md_files = list(examples_path.glob("*.md"))
+        md_files = self._scan_markdown_files(examples_path)
         if not md_files:
             logger.info("No markdown files found in examples directory")
             return
 
-        existing_docs = self._get_existing_document_ids()
-        loaded_count = 0
-        for md_file in md_files:
-            doc_id = self._generate_doc_id(md_file)
+        doc_ids = [self._generate_doc_id(md_file) for md_file in md_files]
+        existing_points = self._get_existing_point_ids(doc_ids)
+        new_files = [
+            (md_file, doc_id)
+            for md_file, doc_id in zip(md_files, doc_ids)
+            if self._string_to_uuid(doc_id) not in existing_points
+            and self._string_to_uuid(f"{doc_id}_chunk_0") not in existing_points
+        ]
+        contents = self._read_markdown_files([md_file for md_file, _ in new_files])
 
-            if doc_id in existing_docs:
+        loaded_count = 0
+        for (md_file, doc_id), content in zip(new_files, contents):
+            if content is None:
+                logger.warning("Error loading %s: could not read file", md_file.name)
                 continue
 
             try:
-                content = md_file.read_text(encoding="utf-8")
                 title = self._extract_title_from_markdown(content, md_file.name)
 
                 chunks = self._split_content(content)
 
-                for i, chunk in enumerate(chunks):
-                    chunk_id = f"{doc_id}_chunk_{i}" if len(chunks) > 1 else doc_id
-                    self._insert_document_chunk(
-                        doc_id=chunk_id,
-                        content=chunk,
-                        title=title,
-                        url=f"qdrant://{self.collection_name}/{md_file.name}",
-                        metadata={"source": "examples", "file": md_file.name},
-                    )
+                chunk_ids = (
+                    [f"{doc_id}_chunk_{i}" for i in range(len(chunks))]
+                    if len(chunks) > 1
+                    else [doc_id]
+                )
+                self._insert_document_chunks(
+                    doc_ids=chunk_ids,
+                    contents=chunks,
+                    title=title,
+                    url=f"qdrant://{self.collection_name}/{md_file.name}",
+                    metadata={"source": "examples", "file": md_file.name},
+                    wait=False,
+                )
 
                 loaded_count += 1
                 logger.debug("Loaded example markdown: %s", md_file.name)
@@ -167,21 +229,53 @@ class QdrantProvider(Retriever):
             except Exception as e:
                 logger.warning("Error loading %s: %s", md_file.name, e)
 
+        if loaded_count:
+            # Intermediate upserts are not awaited; flush once so the loaded
+            # examples are visible to queries issued right after loading.
+            self.client.upsert(
+                collection_name=self.collection_name, points=[], wait=True
+            )
+
         logger.info("Successfully loaded %d example files into Qdrant", loaded_count)
 
+    def _scan_markdown_files(self, examples_path: Path) -> List[Path]:
+        with os.scandir(examples_path) as entries:
+            return [
+                Path(entry.path)
+                for entry in entries
+                if entry.name.endswith(".md") and entry.is_file()
+            ]
+
+    def _read_markdown_files(
+        self, paths: List[Path], errors: str = "strict"
+    ) -> List[Optional[str]]:
+        def read(path: Path) -> Optional[str]:
+            try:
+                return path.read_bytes().decode("utf-8", errors=errors)
+            except Exception as e:
+                logger.debug("Error reading %s: %s", path.name, e)
+                return None
+
+        if not paths:
+            return []
+        # File reads release the GIL, so a thread pool overlaps the disk I/O.
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_READ_WORKERS, len(paths))
+        ) as executor:
+            return list(executor.map(read, paths))
+
     def _generate_doc_id(self, file_path: Path) -> str:
         file_stat = file_path.stat()
-        content_hash = hashlib.md5(
-            f"{file_path.name}_{file_stat.st_size}_{file_stat.st_mtime}".encode()
-        ).hexdigest()[:8]
+        content_hash = hashlib.blake2b(
+            f"{file_path.name}_{file_stat.st_size}_{file_stat.st_mtime}".encode(),
+            digest_size=4,
+        ).hexdigest()
         return f"example_{file_path.stem}_{content_hash}"
 
     def _extract_title_from_markdown(self, content: str, filename: str) -> str:
-        lines = content.split("\n")
-        for line in lines:
-            line = line.strip()
-            if line.startswith("# "):
-                return line[2:].strip()
+        match = _TITLE_RE.search(content)
+        if match:
+            return match.group(1).strip()
 
         return filename.replace(".md", "").replace("_", " ").title()
 
@@ -191,24 +285,26 @@ class QdrantProvider(Retriever):
 
         chunks = []
         paragraphs = content.split("\n\n")
-        current_chunk = ""
+        start = 0
+        # Length of the pending chunk, counting the "\n\n" after each paragraph.
+        running_len = 0
 
-        for paragraph in paragraphs:
-            if len(current_chunk) + len(paragraph) <= self.chunk_size:
-                current_chunk += paragraph + "\n\n"
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                current_chunk = paragraph + "\n\n"
+        for i, paragraph in enumerate(paragraphs):
+            if running_len + len(paragraph) > self.chunk_size and i > start:
+                chunks.append("\n\n".join(paragraphs[start:i]).strip())
+                start = i
+                running_len = 0
+            running_len += len(paragraph) + 2
 
-        if current_chunk:
-            chunks.append(current_chunk.strip())
+        if start < len(paragraphs):
+            chunks.append("\n\n".join(paragraphs[start:]).strip())
 
         return chunks
 
     def _string_to_uuid(self, text: str) -> str:
-        namespace = uuid.NAMESPACE_DNS
-        return str(uuid.uuid5(namespace, text))
+        # Same value as uuid.uuid5(uuid.NAMESPACE_DNS, text), hashed directly.
+        digest = hashlib.sha1(_UUID_NAMESPACE_BYTES + text.encode("utf-8")).digest()
+        return str(uuid.UUID(bytes=digest[:16], version=5))
 
     def _scroll_all_points(
         self,
@@ -216,7 +312,7 @@ class QdrantProvider(Retriever):
         with_payload: bool = True,
         with_vectors: bool = False,
     ) -> List[Any]:
-        results = []
+        pages: List[List[Any]] = []
         next_offset = None
         stop_scrolling = False
 
@@ -234,46 +330,98 @@ class QdrantProvider(Retriever):
                 and getattr(next_offset, "num", 0) == 0
                 and getattr(next_offset, "uuid", "") == ""
             )
-            results.extend(points)
+            pages.append(points)
+
+        return list(itertools.chain.from_iterable(pages))
+
+    async def _ascroll_all_points(
+        self,
+        scroll_filter: Optional[Filter] = None,
+        with_payload: bool = True,
+        with_vectors: bool = False,
+    ) -> List[Any]:
+        pages: List[List[Any]] = []
+        next_offset = None
+        stop_scrolling = False
+
+        while not stop_scrolling:
+            points, next_offset = await self.aclient.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=scroll_filter,
+                limit=SCROLL_SIZE,
+                offset=next_offset,
+                with_payload=with_payload,
+                with_vectors=with_vectors,
+            )
+            stop_scrolling = next_offset is None or (
+                isinstance(next_offset, grpc.PointId)
+                and getattr(next_offset, "num", 0) == 0
+                and getattr(next_offset, "uuid", "") == ""
+            )
+            pages.append(points)
 
-        return results
+        return list(itertools.chain.from_iterable(pages))
 
-    def _get_existing_document_ids(self) -> Set[str]:
+    def _get_existing_point_ids(self, doc_ids: List[str]) -> Set[str]:
+        # A document is stored under its own id when it fits in one chunk and
+        # under "<doc_id>_chunk_<i>" otherwise, so look up both first points.
+        candidate_ids = []
+        for doc_id in doc_ids:
+            candidate_ids.append(self._string_to_uuid(doc_id))
+            candidate_ids.append(self._string_to_uuid(f"{doc_id}_chunk_0"))
         try:
-            points = self._scroll_all_points(with_payload=True, with_vectors=False)
-            return {
-                point.payload.get("doc_id", str(point.id))
-                for point in points
-                if point.payload
-            }
+            points = self.client.retrieve(
+                collection_name=self.collection_name,
+                ids=candidate_ids,
+                with_payload=False,
+                with_vectors=False,
+            )
+            return {str(point.id) for point in points}
         except Exception:
             return set()
 
-    def _insert_document_chunk(
-        self, doc_id: str, content: str, title: str, url: str, metadata: Dict[str, Any]
+    def _insert_document_chunks(
+        self,
+        doc_ids: List[str],
+        contents: List[str],
+        title: str,
+        url: str,
+        metadata: Dict[str, Any],
+        wait: bool = True,
     ) -> None:
-        embedding = self._get_embedding(content)
-
-        payload = {
-            "doc_id": doc_id,
-            "content": content,
-            "title": title,
-            "url": url,
-            **metadata,
-        }
-
-        point_id = self._string_to_uuid(doc_id)
-        point = PointStruct(id=point_id, vector=embedding, payload=payload)
+        # Upsert as a columnar Batch (parallel ids/vectors/payloads) rather
+        # than one PointStruct per chunk.
+        ids: List[str] = []
+        vectors: List[List[float]] = []
+        payloads: List[Dict[str, Any]] = []
+        for doc_id, content in zip(doc_ids, contents):
+            point_id = self._string_to_uuid(doc_id)
+            ids.append(point_id)
+            vectors.append(self._get_embedding(content))
+            payloads.append(
+                {
+                    "doc_id": doc_id,
+                    "content": content,
+                    "title": title,
+                    "url": url,
+                    **metadata,
+                }
+            )
 
         self.client.upsert(
-            collection_name=self.collection_name, points=[point], wait=True
+            collection_name=self.collection_name,
+            points=Batch(ids=ids, vectors=vectors, payloads=payloads),
+            wait=wait,
         )
 
-    def _connect(self) -> None:
+    def _client_kwargs(self) -> Dict[str, Any]:
         client_kwargs = {"location": self.location}
         if self.api_key:
             client_kwargs["api_key"] = self.api_key
-        self.client = QdrantClient(**client_kwargs)
+        return client_kwargs
+
+    def _connect(self) -> None:
+        self.client = QdrantClient(**self._client_kwargs())
 
         self._ensure_collection_exists()
 
@@ -286,9 +434,38 @@ class QdrantProvider(Retriever):
         except Exception:
             self.vector_store = None
 
+    def _get_async_client(self) -> Any:
+        # Created on first async use, inside the caller's event loop. An
+        # in-memory store is private to the client that created it, so the
+        # async client is only used against a shared (remote) instance.
+        if self.aclient is None and self.location != ":memory:":
+            self.aclient = AsyncQdrantClient(**self._client_kwargs())
+        return self.aclient
+
     def _get_embedding(self, text: str) -> List[float]:
         return self.embedding_model.embed_query(text=text.strip())
 
+    def _get_query_embedding(self, query: str) -> List[float]:
+        # Only search queries repeat, so document chunks bypass this cache.
+        query = query.strip()
+        key = hashlib.sha256(query.encode("utf-8")).hexdigest()[:16]
+
+        with self._embedding_cache_lock:
+            cached = self._embedding_cache.get(key)
+            if cached is not None:
+                self._embedding_cache.move_to_end(key)
+                return cached.tolist()
+
+        embedding = array("f", self._get_embedding(query))
+
+        with self._embedding_cache_lock:
+            self._embedding_cache[key] = embedding
+            self._embedding_cache.move_to_end(key)
+            while len(self._embedding_cache) > EMBEDDING_CACHE_SIZE:
+                self._embedding_cache.popitem(last=False)
+        # Return the float32 values on a miss too, so hits and misses agree
+        return embedding.tolist()
+
     def list_resources(self, query: Optional[str] = None) -> List[Resource]:
         resources: List[Resource] = []
 
@@ -328,17 +505,7 @@ class QdrantProvider(Retriever):
                     with_vectors=False,
                 )
 
-                for point in all_points:
-                    payload = point.payload or {}
-                    doc_id = payload.get("doc_id", str(point.id))
-                    uri = payload.get("url", "") or f"qdrant://{doc_id}"
-                    resources.append(
-                        Resource(
-                            uri=uri,
-                            title=payload.get("title", "") or doc_id,
-                            description="Stored Qdrant document",
-                        )
-                    )
+                resources = self._points_to_resources(all_points)
 
             logger.info(
                 "Successfully listed %d resources from Qdrant collection: %s",
@@ -355,9 +522,55 @@ class QdrantProvider(Retriever):
     async def list_resources_async(self, query: Optional[str] = None) -> List[Resource]:
         """
         Asynchronous version of list_resources.
-        Wraps the synchronous implementation in asyncio.to_thread() to avoid blocking the event loop.
+        Scrolls through AsyncQdrantClient when connected to a remote instance;
+        otherwise wraps the synchronous implementation in asyncio.to_thread().
         """
-        return await asyncio.to_thread(self.list_resources, query)
+        if not self.client:
+            try:
+                await asyncio.to_thread(self._connect)
+            except Exception:
+                return self._list_local_markdown_resources()
+
+        if (query and self.vector_store) or not self._get_async_client():
+            return await asyncio.to_thread(self.list_resources, query)
+
+        try:
+            all_points = await self._ascroll_all_points(
+                scroll_filter=Filter(
+                    must=[
+                        FieldCondition(key="source", match=MatchValue(value="examples"))
+                    ]
+                ),
+                with_payload=True,
+                with_vectors=False,
+            )
+            resources = self._points_to_resources(all_points)
+            logger.info(
+                "Successfully listed %d resources from Qdrant collection: %s",
+                len(resources),
+                self.collection_name,
+            )
+        except Exception:
+            logger.warning(
+                "Failed to query Qdrant for resources, falling back to local examples."
+            )
+            return self._list_local_markdown_resources()
+        return resources
+
+    def _points_to_resources(self, points: List[Any]) -> List[Resource]:
+        resources: List[Resource] = []
+        for point in points:
+            payload = point.payload or {}
+            doc_id = payload.get("doc_id", str(point.id))
+            uri = payload.get("url", "") or f"qdrant://{doc_id}"
+            resources.append(
+                Resource(
+                    uri=uri,
+                    title=payload.get("title", "") or doc_id,
+                    description="Stored Qdrant document",
+                )
+            )
+        return resources
 
     def _list_local_markdown_resources(self) -> List[Resource]:
         current_file = Path(__file__)
@@ -366,11 +579,13 @@ class QdrantProvider(Retriever):
         if not examples_path.exists():
             return []
 
-        md_files = list(examples_path.glob("*.md"))
+        md_files = self._scan_markdown_files(examples_path)
+        contents = self._read_markdown_files(md_files, errors="ignore")
         resources: list[Resource] = []
-        for md_file in md_files:
+        for md_file, content in zip(md_files, contents):
+            if content is None:
+                continue
             try:
-                content = md_file.read_text(encoding="utf-8", errors="ignore")
                 title = self._extract_title_from_markdown(content, md_file.name)
                 uri = f"qdrant://{self.collection_name}/{md_file.name}"
                 resources.append(
@@ -391,15 +606,21 @@ class QdrantProvider(Retriever):
         if not self.client:
             self._connect()
 
-        query_embedding = self._get_embedding(query)
+        query_embedding = self._get_query_embedding(query)
 
         search_results = self.client.query_points(
             collection_name=self.collection_name,
             query=query_embedding,
             limit=self.top_k,
             with_payload=True,
+            search_params=QUANTIZED_SEARCH_PARAMS,
         ).points
 
+        return self._build_documents(search_results, resources)
+
+    def _build_documents(
+        self, search_results: List[Any], resources: List[Resource]
+    ) -> List[Document]:
         documents = {}
 
         for result in search_results:
@@ -432,12 +653,30 @@ class QdrantProvider(Retriever):
     ) -> List[Document]:
         """
         Asynchronous version of query_relevant_documents.
-        Wraps the synchronous implementation in asyncio.to_thread() to avoid blocking the event loop.
+        Queries through AsyncQdrantClient when connected to a remote instance;
+        otherwise wraps the synchronous implementation in asyncio.to_thread().
         """
-        return await asyncio.to_thread(
-            self.query_relevant_documents, query, resources
+        resources = resources or []
+        if not self.client:
+            await asyncio.to_thread(self._connect)
+
+        if not self._get_async_client():
+            return await asyncio.to_thread(
+                self.query_relevant_documents, query, resources
+            )
+
+        query_embedding = await asyncio.to_thread(self._get_query_embedding, query)
+
+        response = await self.aclient.query_points(
+            collection_name=self.collection_name,
+            query=query_embedding,
+            limit=self.top_k,
+            with_payload=True,
+            search_params=QUANTIZED_SEARCH_PARAMS,
         )
 
+        return self._build_documents(response.points, resources)
+
     def create_collection(self) -> None:
         if not self.client:
             self._connect()
@@ -511,6 +750,22 @@ class QdrantProvider(Retriever):
             except Exception as e:
                 logger.warning("Exception occurred while closing QdrantProvider: %s", e)
 
+    async def aclose(self) -> None:
+        """Close the async client opened by the async query paths.
+
+        Must be awaited from the event loop that used it; the client is
+        recreated on the next async call.
+        """
+        if getattr(self, "aclient", None):
+            try:
+                await self.aclient.close()
+            except Exception as e:
+                logger.warning(
+                    "Exception occurred while closing async Qdrant client: %s", e
+                )
+            finally:
+                self.aclient = None
+
     def __del__(self) -> None:
         self.close()
 
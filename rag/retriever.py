@@ -7,6 +7,8 @@ from pydantic import BaseModel, Field
 
 
 class Chunk:
+    __slots__ = ("content", "similarity")
+
     content: str
     similarity: float
 
@@ -20,10 +22,12 @@ class Document:
     Document is a class that represents a document.
     """
 
+    __slots__ = ("id", "url", "title", "chunks")
+
     id: str
-    url: str | None = None
-    title: str | None = None
-    chunks: list[Chunk] = []
+    url: str | None
+    title: str | None
+    chunks: list[Chunk]
 
     def __init__(
         self,
@@ -104,6 +108,15 @@ class Retriever(abc.ABC):
         """
         pass
 
+    async def aclose(self) -> None:
+        """
+        Release async resources (e.g. async clients) opened by the provider.
+
+        Callers of the async methods should await this when done. The default
+        implementation has nothing to release.
+        """
+        pass
+
     def ingest_file(self, file_content: bytes, filename: str, **kwargs) -> Resource:
         """
         Ingest a file into the RAG provider and register it as a :class:`Resource`.
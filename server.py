@@ -1,6 +1,7 @@
 import json
 import logging
 import uuid
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any, AsyncGenerator, Optional
 
@@ -12,6 +13,7 @@ from langgraph.types import Command
 from pydantic import BaseModel, Field
 
 from graph import build_graph_with_memory
+from tools.infoquest_search.infoquest_search_api import close_session
 
 logging.basicConfig(
     level=logging.INFO,
@@ -28,7 +30,14 @@ ASSISTANT_NAMES = {
     "background_investigator",
 }
 
-app = FastAPI(title="Mini SearchFlow API", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    yield
+    await close_session()
+
+
+app = FastAPI(title="Mini SearchFlow API", version="0.1.0", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -0,0 +1,31 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from crawler.article import Article
+
+PARAGRAPHS = "".join(f"<p>Paragraph {i} with *stars* and _underscores_.</p>\n" for i in range(200))
+
+
+@pytest.mark.parametrize(
+    "html_content",
+    [
+        "plain text a &lt;b&gt; c",
+        "<div><span>inline one</span> <span>inline two</span> text</div>",
+        "<div>lead text <em>emphasis</em><p>para</p>tail &amp; more<ul><li>a</li><li>b</li></ul></div>",
+        f"<html><body>\n<div><article>{PARAGRAPHS}</article></div>\n</body></html>",
+        "<main>" + "<span>x</span> <!-- note --> <br>" * 100 + "<pre>code\n  block</pre></main>",
+    ],
+)
+@pytest.mark.parametrize("max_chars", [0, 5, 20, 100, 1000, 100000])
+def test_to_markdown_max_chars_is_prefix_of_full_markdown(html_content, max_chars):
+    article = Article("T", html_content)
+
+    assert article.to_markdown(max_chars=max_chars) == article.to_markdown()[:max_chars]
+
+
+def test_to_markdown_max_chars_keeps_escaped_text():
+    article = Article("T", "plain text a &lt;b&gt; c")
+
+    assert article.to_markdown(max_chars=1000) == "# T\n\nplain text a <b> c"
@@ -0,0 +1,111 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import threading
+from collections import OrderedDict
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+pytest.importorskip("qdrant_client")
+
+import rag.qdrant as qdrant_module  # noqa: E402
+from rag.qdrant import QdrantProvider  # noqa: E402
+from tools.retriever import RetrieverTool  # noqa: E402
+
+
+def _make_provider() -> QdrantProvider:
+    # Skip __init__, which reads the environment and builds an embedding model.
+    provider = QdrantProvider.__new__(QdrantProvider)
+    provider.location = "http://localhost:6333"
+    provider.api_key = ""
+    provider.collection_name = "test_collection"
+    provider.top_k = 5
+    provider.client = MagicMock()
+    provider.aclient = None
+    provider.vector_store = None
+    provider.embedding_model = MagicMock()
+    provider.embedding_model.embed_query.return_value = [0.1, 0.2]
+    provider._embedding_cache = OrderedDict()
+    provider._embedding_cache_lock = threading.Lock()
+    return provider
+
+
+@pytest.fixture
+def async_client(monkeypatch):
+    client = MagicMock()
+    client.query_points = AsyncMock(return_value=MagicMock(points=[]))
+    client.close = AsyncMock()
+    client_cls = MagicMock(return_value=client)
+    monkeypatch.setattr(qdrant_module, "AsyncQdrantClient", client_cls)
+    return client
+
+
+def test_aclose_closes_lazily_created_async_client(async_client):
+    provider = _make_provider()
+
+    async def run():
+        await provider.query_relevant_documents_async("query")
+        assert provider.aclient is async_client
+        await provider.aclose()
+
+    asyncio.run(run())
+
+    async_client.close.assert_awaited_once()
+    assert provider.aclient is None
+
+
+def test_close_leaves_async_client_alone(async_client):
+    provider = _make_provider()
+    asyncio.run(provider.query_relevant_documents_async("query"))
+
+    provider.close()
+
+    async_client.close.assert_not_awaited()
+
+
+def test_retriever_tool_closes_async_client_after_query(async_client):
+    provider = _make_provider()
+    tool = RetrieverTool(retriever=provider, resources=[])
+
+    result = asyncio.run(tool._arun("query"))
+
+    assert result == "No results found from the local knowledge base."
+    async_client.close.assert_awaited_once()
+    assert provider.aclient is None
+
+
+def test_query_embeddings_are_cached():
+    provider = _make_provider()
+
+    first = provider._get_query_embedding("query")
+    second = provider._get_query_embedding(" query ")
+
+    assert first == second
+    provider.embedding_model.embed_query.assert_called_once_with(text="query")
+
+
+def test_document_chunks_bypass_query_embedding_cache():
+    provider = _make_provider()
+
+    provider._insert_document_chunks(
+        ["doc"], ["chunk content"], "title", "url", {"source": "examples"}
+    )
+
+    assert len(provider._embedding_cache) == 0
+    provider.client.upsert.assert_called_once()
+
+
+def test_new_collection_indexes_only_source():
+    provider = _make_provider()
+    provider.embedding_dim = 2
+    provider.client.collection_exists.return_value = False
+
+    provider._ensure_collection_exists()
+
+    indexed = [
+        call.kwargs["field_name"]
+        for call in provider.client.create_payload_index.call_args_list
+    ]
+    assert indexed == ["source"]
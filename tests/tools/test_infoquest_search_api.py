@@ -0,0 +1,50 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+from tools.infoquest_search.infoquest_search_api import (
+    InfoQuestAPIWrapper,
+    close_session,
+    get_session,
+)
+
+
+def test_cache_key_does_not_contain_api_key():
+    wrapper = InfoQuestAPIWrapper(infoquest_api_key="secret-token")
+
+    key = wrapper._cache_key("query", -1, "", "JSON")
+
+    assert "secret-token" not in repr(key)
+
+
+def test_cache_key_depends_on_api_key():
+    first = InfoQuestAPIWrapper(infoquest_api_key="token-a")
+    second = InfoQuestAPIWrapper(infoquest_api_key="token-b")
+
+    assert first._cache_key("query", -1, "", "JSON") != second._cache_key(
+        "query", -1, "", "JSON"
+    )
+
+
+def test_get_session_reuses_client_within_a_loop():
+    async def run():
+        client = get_session()
+        assert get_session() is client
+        await close_session()
+        assert client.is_closed
+        assert get_session() is not client
+
+    asyncio.run(run())
+
+
+def test_get_session_closes_client_when_its_loop_shuts_down():
+    async def run():
+        return get_session()
+
+    first = asyncio.run(run())
+    second = asyncio.run(run())
+
+    assert second is not first
+    assert first.is_closed
+    assert second.is_closed
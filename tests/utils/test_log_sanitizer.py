@@ -0,0 +1,14 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from utils.log_sanitizer import create_safe_log_message
+
+
+def test_create_safe_log_message_keeps_negative_zero():
+    assert create_safe_log_message("v={v}", v=0.0) == "v=0.0"
+    assert create_safe_log_message("v={v}", v=-0.0) == "v=-0.0"
+
+
+def test_create_safe_log_message_keeps_int_and_bool_apart():
+    assert create_safe_log_message("v={v}", v=1) == "v=1"
+    assert create_safe_log_message("v={v}", v=True) == "v=True"
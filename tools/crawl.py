@@ -3,8 +3,8 @@
 
 import json
 import logging
+import threading
 from typing import Annotated, Optional
-from urllib.parse import urlparse
 
 from langchain_core.tools import tool
 
@@ -14,13 +14,34 @@ from .decorators import log_io
 
 logger = logging.getLogger(__name__)
 
+_crawler: Optional[Crawler] = None
+_crawler_lock = threading.Lock()
+
+
+def get_crawler() -> Crawler:
+    """Return the shared Crawler so its HTTP sessions are reused across calls."""
+    global _crawler
+    if _crawler is None:
+        with _crawler_lock:
+            if _crawler is None:
+                _crawler = Crawler()
+    return _crawler
+
+
 def is_pdf_url(url: Optional[str]) -> bool:
     """Check if the URL points to a PDF file."""
     if not url:
         return False
-    parsed_url = urlparse(url)
-    # Check if the path ends with .pdf (case insensitive)
-    return parsed_url.path.lower().endswith('.pdf')
+    # Cheaper than urlparse: drop the fragment, query and host, then check
+    # whether the path ends with .pdf (case insensitive)
+    path = url.split("#", 1)[0].split("?", 1)[0]
+    netloc_start = path.find("//")
+    if netloc_start != -1:
+        path_start = path.find("/", netloc_start + 2)
+        if path_start == -1:
+            return False
+        path = path[path_start:]
+    return path.lower().endswith('.pdf')
 
 
 @tool
@@ -41,8 +62,7 @@ def crawl_tool(
         return pdf_message
     
     try:
-        crawler = Crawler()
-        article = crawler.crawl(url)
+        article = get_crawler().crawl(url)
         article_content = compress_crawl_content(article)
         return json.dumps({"url": url, "crawled_content": article_content}, ensure_ascii=False)
     except BaseException as e:
@@ -57,4 +77,4 @@ def compress_crawl_content(article: Article) -> str:
     We can customize this function to implement different compression strategies.
     Currently, it truncates the markdown content to the first 1000 characters.
     """
-    return article.to_markdown()[:1000]
+    return article.to_markdown(max_chars=1000)
@@ -7,24 +7,157 @@ In order to set this up, follow instructions at:
 https://docs.byteplus.com/en/docs/InfoQuest/What_is_Info_Quest
 """
 
-import json
-from typing import Any, Dict, List
-
-import aiohttp
+import asyncio
+import hashlib
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+
+import httpx
+import orjson
 import requests
 from langchain_core.utils import get_from_dict_or_env
-from pydantic import BaseModel, ConfigDict, SecretStr, model_validator
-from config import load_yaml_config
+from pydantic import BaseModel, ConfigDict, PrivateAttr, SecretStr, model_validator
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import get_search_config
 import logging
 
 logger = logging.getLogger(__name__)
 
 INFOQUEST_API_URL = "https://search.infoquest.bytepluses.com"
 
-def get_search_config():
-    config = load_yaml_config("conf.yaml")
-    search_config = config.get("SEARCH_ENGINE", {})
-    return search_config
+# Shared session so sync searches reuse keep-alive connections instead of
+# paying a TCP+TLS handshake per request.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=64,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.1,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=None,
+            raise_on_status=False,
+        ),
+    ),
+)
+
+# Upper bound on a search response body, overridable with
+# SEARCH_ENGINE.max_response_bytes in conf.yaml.
+DEFAULT_MAX_RESPONSE_BYTES = 8 * 1024 * 1024
+RESPONSE_CHUNK_SIZE = 64 * 1024
+
+# Shared read-only default for missing result sections; never mutated.
+_EMPTY: Dict[str, Any] = {}
+
+# Shared HTTP/2 clients for async searches, one per event loop, since a
+# client's connection pool is bound to the loop it was created on. Each entry
+# keeps the async generator that closes its client when the loop shuts down.
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[httpx.AsyncClient, AsyncGenerator[None, None]]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def _close_on_loop_shutdown(
+    client: httpx.AsyncClient,
+) -> AsyncGenerator[None, None]:
+    # asyncio.run() and asyncio.Runner finalize every async generator
+    # started on the loop before closing it, which runs this finally block
+    # while the client's connections can still be closed on their own loop.
+    try:
+        yield
+    finally:
+        await client.aclose()
+
+
+def get_session() -> httpx.AsyncClient:
+    """Return the shared async HTTP client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    # No await between the check and the assignment, so this cannot race
+    # within a loop.
+    entry = _ASYNC_CLIENTS.get(loop)
+    if entry is not None and not entry[0].is_closed:
+        return entry[0]
+
+    client = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=100,
+            max_keepalive_connections=32,
+            keepalive_expiry=60,
+        ),
+        timeout=httpx.Timeout(30.0, connect=5.0),
+        trust_env=True,
+    )
+    closer = _close_on_loop_shutdown(client)
+    # Step the generator to its yield right away so the running loop
+    # registers it for finalization.
+    try:
+        closer.asend(None).send(None)
+    except StopIteration:
+        pass
+    _ASYNC_CLIENTS[loop] = (client, closer)
+    return client
+
+
+# Async searches currently in flight, keyed by event loop, credentials and
+# request parameters.
+_INFLIGHT_SEARCHES: Dict[tuple, "asyncio.Future[Dict]"] = {}
+
+
+async def close_session() -> None:
+    """Close the running loop's shared async HTTP client, e.g. on application shutdown.
+
+    Clients of other event loops are closed when those loops shut down.
+    """
+    entry = _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if entry is not None:
+        await entry[1].aclose()
+
+
+# Recent search results, keyed by credentials and request parameters, so
+# repeated searches skip the HTTP round trip. Entries expire after
+# SEARCH_ENGINE.cache_ttl seconds (0 disables the cache). Cached results are
+# shared between callers and must be treated as read-only.
+DEFAULT_RESULT_CACHE_TTL = 60
+RESULT_CACHE_SIZE = 512
+_RESULT_CACHE: "OrderedDict[tuple, Tuple[float, Dict]]" = OrderedDict()
+_RESULT_CACHE_LOCK = threading.Lock()
+
+
+def _get_cached_result(key: tuple) -> Optional[Dict]:
+    with _RESULT_CACHE_LOCK:
+        entry = _RESULT_CACHE.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del _RESULT_CACHE[key]
+            return None
+        _RESULT_CACHE.move_to_end(key)
+        return entry[1]
+
+
+def _cache_result(key: tuple, result: Dict, ttl: float) -> None:
+    if ttl <= 0:
+        return
+    with _RESULT_CACHE_LOCK:
+        _RESULT_CACHE[key] = (time.monotonic() + ttl, result)
+        _RESULT_CACHE.move_to_end(key)
+        while len(_RESULT_CACHE) > RESULT_CACHE_SIZE:
+            _RESULT_CACHE.popitem(last=False)
+
+
+def _check_response_size(size: int, max_bytes: int) -> None:
+    if size > max_bytes:
+        raise ValueError(
+            f"InfoQuest response exceeds the {max_bytes} byte limit"
+        )
+
 
 class InfoQuestAPIWrapper(BaseModel):
     """Wrapper for InfoQuest Search API."""
@@ -34,6 +167,13 @@ class InfoQuestAPIWrapper(BaseModel):
         extra="forbid",
     )
 
+    # Request headers, built once with the unwrapped key. Private attributes
+    # are excluded from repr and serialisation; never log them.
+    _headers: Dict[str, str] = PrivateAttr(default_factory=dict)
+    # Digest of the key used in cache keys, so the shared result cache never
+    # holds the plaintext token.
+    _credential_id: str = PrivateAttr(default="")
+
     @model_validator(mode="before")
     @classmethod
     def validate_environment(cls, values: Dict) -> Any:
@@ -48,6 +188,27 @@ class InfoQuestAPIWrapper(BaseModel):
         logger.info("BytePlus InfoQuest Product - Environment validation successful")
         return values
 
+    def model_post_init(self, __context: Any) -> None:
+        api_key = self.infoquest_api_key.get_secret_value()
+        self._headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}",
+        }
+        self._credential_id = hashlib.blake2b(
+            api_key.encode("utf-8"), digest_size=16
+        ).hexdigest()
+
+    def _cache_key(
+        self, query: str, time_range: int, site: str, output_format: str
+    ) -> tuple:
+        return (
+            self._credential_id,
+            query,
+            time_range,
+            site,
+            output_format,
+        )
+
     def raw_results(
         self,
         query: str,
@@ -56,45 +217,56 @@ class InfoQuestAPIWrapper(BaseModel):
         output_format: str = "JSON",
     ) -> Dict:
         """Get results from the InfoQuest Search API synchronously."""
+        search_config = get_search_config()
+        cache_key = self._cache_key(query, time_range, site, output_format)
+        cached = _get_cached_result(cache_key)
+        if cached is not None:
+            logger.debug("Returning cached InfoQuest search result")
+            return cached
+
         if logger.isEnabledFor(logging.DEBUG):
             query_truncated = query[:50] + "..." if len(query) > 50 else query
             logger.debug(
                 f"InfoQuest - Search API request initiated | "
                 f"operation=search | "
                 f"query_truncated={query_truncated} | "
-                f"has_time_filter={time_range > 0} | "
-                f"has_site_filter={bool(site)} | "
+                f"time_range={time_range if time_range > 0 else 'none'} | "
+                f"site={site or 'none'} | "
                 f"request_type=sync"
             )
 
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.infoquest_api_key.get_secret_value()}",
-        }
-
         params = {
             "format": output_format,
             "query": query
         }
         if time_range > 0:
             params["time_range"] = time_range
-            logger.debug(f"InfoQuest - Applying time range filter: time_range_days={time_range}")
 
         if site != "":
             params["site"] = site
-            logger.debug(f"InfoQuest - Applying site filter: site={site}")
 
-        response = requests.post(
-            f"{INFOQUEST_API_URL}",
-            headers=headers,
-            json=params
+        max_bytes = search_config.get(
+            "max_response_bytes", DEFAULT_MAX_RESPONSE_BYTES
         )
-        response.raise_for_status()
+        with _SESSION.post(
+            f"{INFOQUEST_API_URL}",
+            headers=self._headers,
+            data=orjson.dumps(params),
+            stream=True,
+        ) as response:
+            response.raise_for_status()
+            _check_response_size(
+                int(response.headers.get("Content-Length") or 0), max_bytes
+            )
+            raw = bytearray()
+            for chunk in response.iter_content(chunk_size=RESPONSE_CHUNK_SIZE):
+                raw += chunk
+                _check_response_size(len(raw), max_bytes)
 
         # Print partial response for debugging
-        response_json = response.json()
+        response_json = orjson.loads(raw)
         if logger.isEnabledFor(logging.DEBUG):
-            response_sample = json.dumps(response_json)[:200] + ("..." if len(json.dumps(response_json)) > 200 else "")
+            response_sample = raw[:200].decode("utf-8", "replace") + ("..." if len(raw) > 200 else "")
             logger.debug(
                 f"Search API request completed successfully | "
                 f"service=InfoQuest | "
@@ -102,7 +274,13 @@ class InfoQuestAPIWrapper(BaseModel):
                 f"response_sample={response_sample}"
             )
 
-        return response_json["search_result"]
+        search_result = response_json["search_result"]
+        _cache_result(
+            cache_key,
+            search_result,
+            search_config.get("cache_ttl", DEFAULT_RESULT_CACHE_TTL),
+        )
+        return search_result
 
     async def raw_results_async(
         self,
@@ -111,7 +289,42 @@ class InfoQuestAPIWrapper(BaseModel):
         site: str,
         output_format: str = "JSON",
     ) -> Dict:
-        """Get results from the InfoQuest Search API asynchronously."""
+        """Get results from the InfoQuest Search API asynchronously.
+
+        Concurrent calls with identical parameters share a single in-flight
+        request unless ``coalesce_requests`` is disabled in the search config.
+        """
+        cache_key = self._cache_key(query, time_range, site, output_format)
+        cached = _get_cached_result(cache_key)
+        if cached is not None:
+            logger.debug("Returning cached InfoQuest search result")
+            return cached
+
+        if not get_search_config().get("coalesce_requests", True):
+            return await self._fetch_raw_results_async(
+                query, time_range, site, output_format
+            )
+
+        key = (asyncio.get_running_loop(), *cache_key)
+        task = _INFLIGHT_SEARCHES.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._fetch_raw_results_async(query, time_range, site, output_format)
+            )
+            _INFLIGHT_SEARCHES[key] = task
+            task.add_done_callback(lambda _: _INFLIGHT_SEARCHES.pop(key, None))
+        else:
+            logger.debug("Joining in-flight InfoQuest search for identical query")
+        # Shield so a cancelled caller does not cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def _fetch_raw_results_async(
+        self,
+        query: str,
+        time_range: int,
+        site: str,
+        output_format: str = "JSON",
+    ) -> Dict:
 
         if logger.isEnabledFor(logging.DEBUG):
             query_truncated = query[:50] + "..." if len(query) > 50 else query
@@ -119,114 +332,128 @@ class InfoQuestAPIWrapper(BaseModel):
                 f"BytePlus InfoQuest - Search API async request initiated | "
                 f"operation=search | "
                 f"query_truncated={query_truncated} | "
-                f"has_time_filter={time_range > 0} | "
-                f"has_site_filter={bool(site)} | "
+                f"time_range={time_range if time_range > 0 else 'none'} | "
+                f"site={site or 'none'} | "
                 f"request_type=async"
             )
         # Function to perform the API call
-        async def fetch() -> str:
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self.infoquest_api_key.get_secret_value()}",
-            }
+        search_config = get_search_config()
+        max_bytes = search_config.get(
+            "max_response_bytes", DEFAULT_MAX_RESPONSE_BYTES
+        )
+
+        async def fetch() -> bytearray:
             params = {
                 "format": output_format,
                 "query": query,
             }
             if time_range > 0:
                 params["time_range"] = time_range
-                logger.debug(f"Applying time range filter in async request: {time_range} days")
             if site != "":
                 params["site"] = site
-                logger.debug(f"Applying site filter in async request: {site}")
 
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.post(f"{INFOQUEST_API_URL}", headers=headers, json=params) as res:
-                    if res.status == 200:
-                        data = await res.text()
-                        return data
-                    else:
-                        raise Exception(f"Error {res.status}: {res.reason}")
-        results_json_str = await fetch()
+            async with get_session().stream(
+                "POST",
+                f"{INFOQUEST_API_URL}",
+                headers=self._headers,
+                content=orjson.dumps(params),
+            ) as res:
+                res.raise_for_status()
+                _check_response_size(
+                    int(res.headers.get("Content-Length") or 0), max_bytes
+                )
+                body = bytearray()
+                async for chunk in res.aiter_bytes(RESPONSE_CHUNK_SIZE):
+                    body += chunk
+                    _check_response_size(len(body), max_bytes)
+                return body
+        raw = await fetch()
 
         # Print partial response for debugging
         if logger.isEnabledFor(logging.DEBUG):
-            response_sample = results_json_str[:200] + ("..." if len(results_json_str) > 200 else "")
+            response_sample = raw[:200].decode("utf-8", "replace") + ("..." if len(raw) > 200 else "")
             logger.debug(
                 f"Async search API request completed successfully | "
                 f"service=InfoQuest | "
                 f"status=success | "
                 f"response_sample={response_sample}"
             )
-        return json.loads(results_json_str)["search_result"]
+        search_result = orjson.loads(raw)["search_result"]
+        _cache_result(
+            self._cache_key(query, time_range, site, output_format),
+            search_result,
+            search_config.get("cache_ttl", DEFAULT_RESULT_CACHE_TTL),
+        )
+        return search_result
 
     def clean_results_with_images(
         self, raw_results: List[Dict[str, Dict[str, Dict[str, Any]]]]
     ) -> List[Dict]:
         """Clean results from InfoQuest Search API."""
         logger.debug("Processing search results")
+        if not raw_results:
+            logger.debug("Results processing completed | total_results=0")
+            return []
 
         seen_urls = set()
         clean_results = []
-        counts = {"pages": 0, "news": 0, "images": 0}
+        # Bind hot methods and counters to locals for the loop below
+        append = clean_results.append
+        add = seen_urls.add
+        pages = news = images = 0
 
         for content_list in raw_results:
-            content = content_list["content"]
-            results = content["results"]
-
-
-            if results.get("organic"):
-                organic_results = results["organic"]
-                for result in organic_results:
-                    clean_result = {
+            results = content_list["content"]["results"]
+            organic = results.get("organic") or ()
+            stories = (results.get("top_stories") or _EMPTY).get("items") or ()
+            image_items = (results.get("images") or _EMPTY).get("items") or ()
+            if not (organic or stories or image_items):
+                continue
+
+            for result in organic:
+                url = result["url"]
+                if isinstance(url, str) and url and url not in seen_urls:
+                    add(url)
+                    append({
                         "type": "page",
                         "title": result["title"],
-                        "url": result["url"],
+                        "url": url,
                         "desc": result["desc"],
-                    }
-                    url = clean_result["url"]
-                    if isinstance(url, str) and url and url not in seen_urls:
-                        seen_urls.add(url)
-                        clean_results.append(clean_result)
-                        counts["pages"] += 1
-
-            if results.get("top_stories"):
-                news = results["top_stories"]
-                for obj in news["items"]:
-                    clean_result = {
+                    })
+                    pages += 1
+
+            for obj in stories:
+                url = obj["url"]
+                if isinstance(url, str) and url and url not in seen_urls:
+                    add(url)
+                    append({
                         "type": "news",
                         "time_frame": obj["time_frame"],
                         "title": obj["title"],
-                        "url": obj["url"],
+                        "url": url,
                         "source": obj["source"],
-                    }
-                    url = clean_result["url"]
-                    if isinstance(url, str) and url and url not in seen_urls:
-                        seen_urls.add(url)
-                        clean_results.append(clean_result)
-                        counts["news"] += 1
-
-            if results.get("images"):
-                images = results["images"]
-                for image in images["items"]:
-                    clean_result = {
+                    })
+                    news += 1
+
+            for image in image_items:
+                url = image["url"]
+                if isinstance(url, str) and url and url not in seen_urls:
+                    add(url)
+                    append({
                         "type": "image_url",
-                        "image_url": image["url"],
+                        "image_url": url,
                         "image_description": image["alt"],
-                    }
-                    url = clean_result["image_url"]
-                    if isinstance(url, str) and url and url not in seen_urls:
-                        seen_urls.add(url)
-                        clean_results.append(clean_result)
-                        counts["images"] += 1
+                    })
+                    images += 1
 
         logger.debug(
-            f"Results processing completed | "
-            f"total_results={len(clean_results)} | "
-            f"pages={counts['pages']} | "
-            f"news_items={counts['news']} | "
-            f"images={counts['images']} | "
-            f"unique_urls={len(seen_urls)}"
+            "Results processing completed | "
+            "total_results=%d | pages=%d | news_items=%d | images=%d | unique_urls=%d",
+            len(clean_results),
+            pages,
+            news,
+            images,
+            len(seen_urls),
         )
 
         return clean_results
\ No newline at end of file
@@ -3,9 +3,12 @@
 
 """Tool for the InfoQuest search API."""
 
+import asyncio
 import json
 import logging
 from typing import Any, Dict, List, Literal, Optional, Tuple, Type, Union
+
+import orjson
 from langchain_core.callbacks import (
     AsyncCallbackManagerForToolRun,
     CallbackManagerForToolRun,
@@ -17,6 +20,13 @@ from tools.infoquest_search.infoquest_search_api import InfoQuestAPIWrapper
 
 logger = logging.getLogger(__name__)
 
+def _in_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
 class InfoQuestInput(BaseModel):
     """Input for the InfoQuest tool."""
 
@@ -30,7 +40,7 @@ Setup:
 
     .. code-block:: bash
 
-        pip install -U langchain-community aiohttp
+        pip install -U langchain-community "httpx[http2]"
         export INFOQUEST_API_KEY="your-api-key"
 
 Instantiate:
@@ -165,8 +175,17 @@ Invoke with tool call:
             run_manager: Optional[CallbackManagerForToolRun] = None,
     ) -> Tuple[Union[List[Dict[str, str]], str], Dict]:
         """Use the tool."""
+        if _in_event_loop():
+            logger.warning(
+                "InfoQuest search called synchronously from a running event loop; "
+                "the loop is blocked until the request finishes. Use ainvoke instead."
+            )
         try:
-            logger.debug(f"Executing search with parameters: time_range={self.time_range}, site={self.site}")
+            logger.debug(
+                "Executing search with parameters: time_range=%s, site=%s",
+                self.time_range,
+                self.site,
+            )
             raw_results = self.api_wrapper.raw_results(
                 query,
                 self.time_range,
@@ -175,19 +194,16 @@ Invoke with tool call:
             logger.debug("Processing raw search results")
             cleaned_results = self.api_wrapper.clean_results_with_images(raw_results["results"])
 
-            result_json = json.dumps(cleaned_results, ensure_ascii=False)
+            result_json = orjson.dumps(cleaned_results).decode("utf-8")
 
             logger.info(
-                f"Search tool execution completed | "
-                f"mode=synchronous | "
-                f"results_count={len(cleaned_results)}"
+                "Search tool execution completed | mode=synchronous | results_count=%d",
+                len(cleaned_results),
             )
             return result_json, raw_results
         except Exception as e:
             logger.error(
-                f"Search tool execution failed | "
-                f"mode=synchronous | "
-                f"error={str(e)}"
+                "Search tool execution failed | mode=synchronous | error=%s", e
             )
             error_result = json.dumps({"error": repr(e)}, ensure_ascii=False)
             return error_result, {}
@@ -206,7 +222,11 @@ Invoke with tool call:
                 f"query={query_truncated}"
             )
         try:
-            logger.debug(f"Executing async search with parameters: time_range={self.time_range}, site={self.site}")
+            logger.debug(
+                "Executing async search with parameters: time_range=%s, site=%s",
+                self.time_range,
+                self.site,
+            )
 
             raw_results = await self.api_wrapper.raw_results_async(
                 query,
@@ -217,20 +237,17 @@ Invoke with tool call:
             logger.debug("Processing raw async search results")
             cleaned_results = self.api_wrapper.clean_results_with_images(raw_results["results"])
 
-            result_json = json.dumps(cleaned_results, ensure_ascii=False)
+            result_json = orjson.dumps(cleaned_results).decode("utf-8")
 
             logger.debug(
-                f"Search tool execution completed | "
-                f"mode=asynchronous | "
-                f"results_count={len(cleaned_results)}"
+                "Search tool execution completed | mode=asynchronous | results_count=%d",
+                len(cleaned_results),
             )
 
             return result_json, raw_results
         except Exception as e:
             logger.error(
-                f"Search tool execution failed | "
-                f"mode=asynchronous | "
-                f"error={str(e)}"
+                "Search tool execution failed | mode=asynchronous | error=%s", e
             )
             error_result = json.dumps({"error": repr(e)}, ensure_ascii=False)
             return error_result, {}
\ No newline at end of file
@@ -50,9 +50,14 @@ class RetrieverTool(BaseTool):
         logger.info(
             f"Retriever tool query: {keywords}", extra={"resources": self.resources}
         )
-        documents = await self.retriever.query_relevant_documents_async(
-            keywords, self.resources
-        )
+        try:
+            documents = await self.retriever.query_relevant_documents_async(
+                keywords, self.resources
+            )
+        finally:
+            # Async clients are bound to this event loop; release them now
+            # rather than leaving them to the garbage collector.
+            await self.retriever.aclose()
         if not documents:
             return "No results found from the local knowledge base."
         return [doc.to_dict() for doc in documents]
@@ -1,28 +1,49 @@
 # src/tools/search_postprocessor.py
 import base64
+import heapq
 import logging
 import re
-from typing import Any, Dict, List
-from urllib.parse import urlparse
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
 
 logger = logging.getLogger(__name__)
 
+_BASE64_RE = re.compile(r"data:image/[^;]+;base64,[a-zA-Z0-9+/=]+")
+
+
+def _url_key(url: Any) -> Any:
+    """Normalize a URL for duplicate detection (host case, trailing slash, fragment)"""
+    if not isinstance(url, str):
+        return url
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    return (parts.scheme, parts.netloc.lower(), parts.path.rstrip("/"), parts.query)
+
 
 class SearchResultPostProcessor:
     """Search result post-processor"""
 
-    base64_pattern = r"data:image/[^;]+;base64,[a-zA-Z0-9+/=]+"
+    base64_pattern = _BASE64_RE.pattern
 
-    def __init__(self, min_score_threshold: float, max_content_length_per_page: int):
+    def __init__(
+        self,
+        min_score_threshold: float,
+        max_content_length_per_page: int,
+        top_k: Optional[int] = None,
+    ):
         """
         Initialize the post-processor
 
         Args:
             min_score_threshold: Minimum relevance score threshold
             max_content_length_per_page: Maximum content length
+            top_k: Keep only the top_k highest scoring results (all when None)
         """
         self.min_score_threshold = min_score_threshold
         self.max_content_length_per_page = max_content_length_per_page
+        self.top_k = top_k
 
     def process_results(self, results: List[Dict]) -> List[Dict]:
         """
@@ -71,13 +92,19 @@ class SearchResultPostProcessor:
             if cleaned_result:
                 cleaned_results.append(cleaned_result)
 
-        # 5. Sort (by score descending)
-        sorted_results = sorted(
-            cleaned_results, key=lambda x: x.get("score", 0), reverse=True
-        )
+        # 5. Sort (by score descending). nlargest keeps the same order as a
+        # full sort but only tracks top_k results
+        if self.top_k and self.top_k < len(cleaned_results):
+            sorted_results = heapq.nlargest(
+                self.top_k, cleaned_results, key=lambda x: x.get("score", 0)
+            )
+        else:
+            sorted_results = sorted(
+                cleaned_results, key=lambda x: x.get("score", 0), reverse=True
+            )
 
         logger.info(
-            f"Search result post-processing: {len(results)} -> {len(sorted_results)}"
+            "Search result post-processing: %d -> %d", len(results), len(sorted_results)
         )
         return sorted_results
 
@@ -90,111 +117,120 @@ class SearchResultPostProcessor:
             cleaned_result = self.processImage(result)
         else:
             # For other types, keep as is
-            cleaned_result = result.copy()
+            cleaned_result = result
 
         return cleaned_result
 
     def processPage(self, result: Dict) -> Dict:
         """Process page type result"""
-        # Clean base64 images from content
-        cleaned_result = result.copy()
+        # The result is only copied once something in it changes
+        cleaned_result = result
 
-        if "content" in result:
+        # Clean base64 images from content. Every base64 match starts with
+        # "data:image", and a substring test is far cheaper than the regex
+        if "content" in result and "data:image" in result["content"]:
             original_content = result["content"]
-            cleaned_content = re.sub(self.base64_pattern, " ", original_content)
+            cleaned_content = _BASE64_RE.sub(" ", original_content)
+            cleaned_result = result.copy()
             cleaned_result["content"] = cleaned_content
 
             # Log if significant content was removed
             if len(cleaned_content) < len(original_content) * 0.8:
                 logger.debug(
-                    f"Removed base64 images from search content: {result.get('url', 'unknown')}"
+                    "Removed base64 images from search content: %s",
+                    result.get("url", "unknown"),
                 )
 
         # Clean base64 images from raw content
-        if "raw_content" in cleaned_result:
-            original_raw_content = cleaned_result["raw_content"]
-            cleaned_raw_content = re.sub(self.base64_pattern, " ", original_raw_content)
+        if "raw_content" in result and "data:image" in result["raw_content"]:
+            original_raw_content = result["raw_content"]
+            cleaned_raw_content = _BASE64_RE.sub(" ", original_raw_content)
+            if cleaned_result is result:
+                cleaned_result = result.copy()
             cleaned_result["raw_content"] = cleaned_raw_content
 
             # Log if significant content was removed
             if len(cleaned_raw_content) < len(original_raw_content) * 0.8:
                 logger.debug(
-                    f"Removed base64 images from search raw content: {result.get('url', 'unknown')}"
+                    "Removed base64 images from search raw content: %s",
+                    result.get("url", "unknown"),
                 )
 
         return cleaned_result
 
     def processImage(self, result: Dict) -> Dict:
         """Process image type result - clean up base64 data and long fields"""
-        cleaned_result = result.copy()
+        # The result is only copied once something in it changes
+        cleaned_result = result
 
         # Remove base64 encoded data from image_url if present
-        if "image_url" in cleaned_result and isinstance(
-            cleaned_result["image_url"], str
-        ):
-            # Check if image_url contains base64 data
-            if "data:image" in cleaned_result["image_url"]:
-                original_image_url = cleaned_result["image_url"]
-                cleaned_image_url = re.sub(self.base64_pattern, " ", original_image_url)
-                if len(cleaned_image_url) == 0 or not cleaned_image_url.startswith(
-                    "http"
-                ):
-                    logger.debug(
-                        f"Removed base64 data from image_url and the cleaned_image_url is empty or not start with http, origin image_url: {result.get('image_url', 'unknown')}"
-                    )
-                    return {}
-                cleaned_result["image_url"] = cleaned_image_url
+        image_url = result.get("image_url")
+        if isinstance(image_url, str) and "data:image" in image_url:
+            cleaned_image_url = _BASE64_RE.sub(" ", image_url)
+            if len(cleaned_image_url) == 0 or not cleaned_image_url.startswith(
+                "http"
+            ):
                 logger.debug(
-                    f"Removed base64 data from image_url: {result.get('image_url', 'unknown')}"
+                    "Removed base64 data from image_url and the cleaned_image_url is empty or not start with http, origin image_url: %s",
+                    image_url,
                 )
+                return {}
+            cleaned_result = result.copy()
+            cleaned_result["image_url"] = cleaned_image_url
+            logger.debug("Removed base64 data from image_url: %s", image_url)
 
         # Truncate very long image descriptions
-        if "image_description" in cleaned_result and isinstance(
-            cleaned_result["image_description"], str
+        image_description = result.get("image_description")
+        if (
+            isinstance(image_description, str)
+            and self.max_content_length_per_page
+            and len(image_description) > self.max_content_length_per_page
         ):
-            if (
-                self.max_content_length_per_page
-                and len(cleaned_result["image_description"])
-                > self.max_content_length_per_page
-            ):
-                cleaned_result["image_description"] = (
-                    cleaned_result["image_description"][
-                        : self.max_content_length_per_page
-                    ]
-                    + "..."
-                )
-                logger.info(
-                    f"Truncated long image description from search result: {result.get('image_url', 'unknown')}"
-                )
+            if cleaned_result is result:
+                cleaned_result = result.copy()
+            cleaned_result["image_description"] = (
+                image_description[: self.max_content_length_per_page] + "..."
+            )
+            logger.info(
+                "Truncated long image description from search result: %s",
+                result.get("image_url", "unknown"),
+            )
 
         return cleaned_result
 
     def _truncate_long_content(self, result: Dict) -> Dict:
         """Truncate long content"""
 
-        truncated_result = result.copy()
+        # The result is only copied once something in it changes
+        truncated_result = result
 
         # Truncate content length
-        if "content" in truncated_result:
-            content = truncated_result["content"]
-            if len(content) > self.max_content_length_per_page:
-                truncated_result["content"] = (
-                    content[: self.max_content_length_per_page] + "..."
-                )
-                logger.info(
-                    f"Truncated long content from search result: {result.get('url', 'unknown')}"
-                )
+        content = result.get("content")
+        if content is not None and len(content) > self.max_content_length_per_page:
+            truncated_result = result.copy()
+            truncated_result["content"] = (
+                content[: self.max_content_length_per_page] + "..."
+            )
+            logger.info(
+                "Truncated long content from search result: %s",
+                result.get("url", "unknown"),
+            )
 
         # Truncate raw content length (can be slightly longer)
-        if "raw_content" in truncated_result:
-            raw_content = truncated_result["raw_content"]
-            if len(raw_content) > self.max_content_length_per_page * 2:
-                truncated_result["raw_content"] = (
-                    raw_content[: self.max_content_length_per_page * 2] + "..."
-                )
-                logger.info(
-                    f"Truncated long raw content from search result: {result.get('url', 'unknown')}"
-                )
+        raw_content = result.get("raw_content")
+        if (
+            raw_content is not None
+            and len(raw_content) > self.max_content_length_per_page * 2
+        ):
+            if truncated_result is result:
+                truncated_result = result.copy()
+            truncated_result["raw_content"] = (
+                raw_content[: self.max_content_length_per_page * 2] + "..."
+            )
+            logger.info(
+                "Truncated long raw content from search result: %s",
+                result.get("url", "unknown"),
+            )
 
         return truncated_result
 
@@ -209,11 +245,13 @@ class SearchResultPostProcessor:
             else:
                 url = image_url_val
 
-        if url and url not in seen_urls:
-            seen_urls.add(url)
-            return result.copy()  # Return a copy to avoid modifying original
-        elif not url:
-            # Keep results with empty URLs
-            return result.copy()  # Return a copy to avoid modifying original
+        if url:
+            key = _url_key(url)
+            if key in seen_urls:
+                return {}  # Return empty dict for duplicates
+            seen_urls.add(key)
+            # Later stages copy before modifying, so the original is never changed
+            return result
 
-        return {}  # Return empty dict for duplicates
+        # Keep results with empty URLs
+        return result
@@ -12,16 +12,10 @@ from langchain_tavily.tavily_search import (
     TavilySearchAPIWrapper as OriginalTavilySearchAPIWrapper,
 )
 
-from config import load_yaml_config
+from config import get_search_config
 from tools.search_postprocessor import SearchResultPostProcessor
 
 
-def get_search_config():
-    config = load_yaml_config("conf.yaml")
-    search_config = config.get("SEARCH_ENGINE", {})
-    return search_config
-
-
 class EnhancedTavilySearchAPIWrapper(OriginalTavilySearchAPIWrapper):
     def raw_results(
         self,
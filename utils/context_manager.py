@@ -2,7 +2,8 @@
 import copy
 import json
 import logging
-from typing import List
+import weakref
+from typing import Dict, List, Tuple
 
 from langgraph.runtime import Runtime 
 
@@ -38,6 +39,9 @@ class ContextManager:
         """
         self.token_limit = token_limit
         self.preserve_prefix_message_count = preserve_prefix_message_count
+        # Token estimates keyed by id(message), holding a weak reference to the
+        # message and its content length to detect reuse of the id or changed content
+        self._token_cache: Dict[int, Tuple[weakref.ref, int, int]] = {}
 
     def count_tokens(self, messages: List[BaseMessage]) -> int:
         """
@@ -56,7 +60,33 @@ class ContextManager:
 
     def _count_message_tokens(self, message: BaseMessage) -> int:
         """
-        Count tokens in a single message
+        Count tokens in a single message, reusing the estimate for a message
+        that was already counted and whose content length has not changed
+
+        Args:
+            message: Message object
+
+        Returns:
+            Number of tokens
+        """
+        content = getattr(message, "content", None)
+        content_length = len(content) if isinstance(content, str) else -1
+        key = id(message)
+        cached = self._token_cache.get(key)
+        if cached is not None and cached[0]() is message and cached[1] == content_length:
+            return cached[2]
+
+        token_count = self._estimate_message_tokens(message)
+        try:
+            ref = weakref.ref(message, lambda _, key=key, cache=self._token_cache: cache.pop(key, None))
+        except TypeError:
+            return token_count
+        self._token_cache[key] = (ref, content_length, token_count)
+        return token_count
+
+    def _estimate_message_tokens(self, message: BaseMessage) -> int:
+        """
+        Estimate tokens in a single message
 
         Args:
             message: Message object
@@ -119,15 +149,13 @@ class ContextManager:
         if not text:
             return 0
 
-        english_chars = 0
-        non_english_chars = 0
-
-        for char in text:
-            # Check if character is ASCII (English letters, digits, punctuation)
-            if ord(char) < 128:
-                english_chars += 1
-            else:
-                non_english_chars += 1
+        # ASCII (English letters, digits, punctuation) is counted in C: the
+        # isascii() flag check covers pure ASCII text, and encoding with
+        # errors="ignore" drops exactly the non-ASCII characters otherwise
+        if text.isascii():
+            return len(text) // 4
+        english_chars = len(text.encode("ascii", "ignore"))
+        non_english_chars = len(text) - english_chars
 
         # Calculate tokens: English at 4 chars/token, others at 1 char/token
         english_tokens = english_chars // 4
@@ -169,12 +197,12 @@ class ContextManager:
 
         messages = state["messages"]
 
-        if not self.is_over_limit(messages):
-            logger.debug(f"Messages within limit ({self.count_tokens(messages)} <= {self.token_limit} tokens)")
+        original_token_count = self.count_tokens(messages)
+        if original_token_count <= self.token_limit:
+            logger.debug("Messages within limit (%d <= %d tokens)", original_token_count, self.token_limit)
             return state
 
         # Compress messages
-        original_token_count = self.count_tokens(messages)
         compressed_messages = self._compress_messages(messages)
         compressed_token_count = self.count_tokens(compressed_messages)
 
@@ -197,11 +225,12 @@ class ContextManager:
         Returns:
             List of messages with compressed content and/or dropped messages
         """
-        # Create a deep copy to avoid mutating original messages
-        compressed = copy.deepcopy(messages)
+        # Copy the list only; messages that get compressed are replaced with
+        # updated copies, so the original messages are never mutated
+        compressed = list(messages)
         
         # Step 1: Compress raw_content in web_search ToolMessages
-        for msg in compressed:
+        for idx, msg in enumerate(compressed):
             # Only compress ToolMessage with name 'web_search'
             if isinstance(msg, ToolMessage) and getattr(msg, "name", None) == "web_search":
                 try:
@@ -240,36 +269,39 @@ class ContextManager:
                         
                         # Update message content with modified data only if changes were made
                         if modified:
-                            msg.content = json.dumps(content_data, ensure_ascii=False)
+                            compressed[idx] = msg.model_copy(
+                                update={"content": json.dumps(content_data, ensure_ascii=False)}
+                            )
                     elif isinstance(msg.content, str) and len(msg.content) > 8000:
-                        msg.content = msg.content[:8000]
+                        compressed[idx] = msg.model_copy(update={"content": msg.content[:8000]})
                 except Exception as e:
                     logger.error(f"Unexpected error during message compression: {e}")
                     continue
 
         # Step 2: If still over limit after raw_content compression, drop oldest messages
-        # while preserving prefix messages (e.g., system message) and recent messages
-        if self.is_over_limit(compressed):
-            # Identify messages to preserve at the beginning
+        # while preserving prefix messages (e.g., system message) and recent messages.
+        # Messages are counted once and the kept total is tracked incrementally.
+        token_counts = [self._count_message_tokens(msg) for msg in compressed]
+        total_tokens = sum(token_counts)
+        if total_tokens > self.token_limit:
             preserved_count = self.preserve_prefix_message_count
-            preserved_messages = compressed[:preserved_count]
-            remaining_messages = compressed[preserved_count:]
-            
+            total_tokens = sum(token_counts[:preserved_count])
+
             # Drop messages from the middle, keeping the most recent ones
-            result_messages = preserved_messages
-            for msg in reversed(remaining_messages):
-                result_messages.insert(len(preserved_messages), msg)
-                if not self.is_over_limit(result_messages):
+            start = len(compressed)
+            while start > preserved_count:
+                start -= 1
+                total_tokens += token_counts[start]
+                if total_tokens <= self.token_limit:
                     break
-            
-            compressed = result_messages
+
+            compressed = compressed[:preserved_count] + compressed[start:]
 
         # Step 3: Verify that compression was successful and log warning if needed
-        if self.is_over_limit(compressed):
-            current_tokens = self.count_tokens(compressed)
+        if total_tokens > self.token_limit:
             logger.warning(
                 f"Message compression failed to bring tokens below limit: "
-                f"{current_tokens} > {self.token_limit} tokens. "
+                f"{total_tokens} > {self.token_limit} tokens. "
                 f"Total messages: {len(compressed)}. "
                 f"Consider increasing token_limit or preserve_prefix_message_count."
             )
@@ -307,34 +339,38 @@ class ContextManager:
         Returns:
             Trimmed list of messages within budget (best effort).
         """
-        trimmed = copy.deepcopy(messages)
+        trimmed = list(messages)
 
-        for msg in trimmed:
+        for idx, msg in enumerate(trimmed):
             if not hasattr(msg, "content"):
                 continue
             if isinstance(msg.content, str) and len(msg.content) > max_message_chars:
-                msg.content = msg.content[:max_message_chars].rstrip() + "..."
+                trimmed[idx] = msg.model_copy(
+                    update={"content": msg.content[:max_message_chars].rstrip() + "..."}
+                )
 
-        if not self.is_over_limit(trimmed) or self.count_tokens(trimmed) <= hard_limit:
+        token_counts = [self._count_message_tokens(msg) for msg in trimmed]
+        total_tokens = sum(token_counts)
+        if total_tokens <= self.token_limit or total_tokens <= hard_limit:
             return trimmed
 
         preserved_count = self.preserve_prefix_message_count
-        preserved_messages = trimmed[:preserved_count]
-        remaining_messages = trimmed[preserved_count:]
+        total_tokens = sum(token_counts[:preserved_count])
 
-        result_messages = preserved_messages[:]
-        for msg in reversed(remaining_messages):
-            result_messages.insert(len(preserved_messages), msg)
-            if self.count_tokens(result_messages) <= hard_limit:
+        start = len(trimmed)
+        while start > preserved_count:
+            start -= 1
+            total_tokens += token_counts[start]
+            if total_tokens <= hard_limit:
                 break
 
-        if self.count_tokens(result_messages) > hard_limit:
+        if total_tokens > hard_limit:
             logger.warning(
                 "Hard token budget enforcement did not fully succeed: "
-                f"{self.count_tokens(result_messages)} > {hard_limit} tokens."
+                f"{total_tokens} > {hard_limit} tokens."
             )
 
-        return result_messages
+        return trimmed[:preserved_count] + trimmed[start:]
 
 
 def validate_message_content(messages: List[BaseMessage], max_content_length: int = 100000) -> List[BaseMessage]:
@@ -383,12 +419,12 @@ def validate_message_content(messages: List[BaseMessage], max_content_length: in
             
             # Handle complex content types (convert to JSON)
             elif isinstance(msg.content, (list, dict)):
-                logger.debug(f"Message {i} ({type(msg).__name__}) has complex content type {type(msg.content).__name__}, converting to JSON")
+                logger.debug("Message %d (%s) has complex content type %s, converting to JSON", i, type(msg).__name__, type(msg.content).__name__)
                 msg.content = json.dumps(msg.content, ensure_ascii=False)
             
             # Handle other non-string types
             elif not isinstance(msg.content, str):
-                logger.debug(f"Message {i} ({type(msg).__name__}) has non-string content type {type(msg.content).__name__}, converting to string")
+                logger.debug("Message %d (%s) has non-string content type %s, converting to string", i, type(msg).__name__, type(msg.content).__name__)
                 msg.content = str(msg.content)
             
             # Validate content length
@@ -7,10 +7,27 @@ import re
 from typing import Any
 
 import json_repair
-import re
 
 logger = logging.getLogger(__name__)
 
+# Opening markdown code fence (```json, ```ts or ```), allowing optional leading
+# spaces and multiple blank lines after the fence.
+_MD_OPEN_FENCE_RE = re.compile(r'^[ \t]*```(?:json|ts)?[ \t]*\n+', re.IGNORECASE | re.MULTILINE)
+# Closing markdown code fence, allowing optional leading newlines and trailing spaces.
+_MD_CLOSE_FENCE_RE = re.compile(r'\n*```[ \t]*$', re.MULTILINE)
+# Tokens for the JSON extraction scanner: a complete string literal, an escaped
+# character, a bracket, or a quote that opens an unterminated string.
+_JSON_TOKEN_RE = re.compile(r'"[^"\\]*(?:\\[\s\S][^"\\]*)*"|\\[\s\S]?|[{}\[\]]|"')
+# First characters of a JSON object or array.
+_JSON_STARTS = frozenset("{[")
+# Control characters that some quantized models emit as garbage.
+_CONTROL_CHARS_RE = re.compile(r'[\x00-\x08\x0B-\x0C\x0E-\x1F\x7F-\x9F]')
+# Same characters as a translate table. str.translate is much faster than the
+# regex on ASCII text but much slower on non-ASCII text, so both are kept.
+_CONTROL_CHARS_TABLE = dict.fromkeys(
+    [*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), *range(0x7F, 0xA0)]
+)
+
 
 def sanitize_args(args: Any) -> str:
     """
@@ -56,24 +73,22 @@ def _extract_json_from_content(content: str) -> str:
     bracket_count = 0
     seen_opening_brace = False
     seen_opening_bracket = False
-    in_string = False
-    escape_next = False
     last_valid_end = -1
     
-    for i, char in enumerate(content):
-        if escape_next:
-            escape_next = False
-            continue
-        
-        if char == '\\':
-            escape_next = True
-            continue
+    # The regex engine skips over whole strings and escaped characters, so
+    # this loop only sees brackets
+    for match in _JSON_TOKEN_RE.finditer(content):
+        i = match.start()
+        char = content[i]
         
-        if char == '"' and not escape_next:
-            in_string = not in_string
+        if char == '"':
+            # A lone quote starts a string that never closes, so nothing
+            # after it can change the result
+            if match.end() - i == 1:
+                break
             continue
         
-        if in_string:
+        if char == '\\':
             continue
         
         if char == '{':
@@ -96,7 +111,7 @@ def _extract_json_from_content(content: str) -> str:
     if last_valid_end > 0:
         truncated = content[:last_valid_end + 1]
         if truncated != content:
-            logger.debug(f"Truncated content from {len(content)} to {len(truncated)} chars")
+            logger.debug("Truncated content from %d to %d chars", len(content), len(truncated))
         return truncated
     
     return content
@@ -125,22 +140,8 @@ def repair_json_output(content: str) -> str:
     # Handle markdown code blocks (```json, ```ts, or ```)
     # This must be checked first, as content may start with ``` instead of { or [
     if "```" in content:
-        # Remove opening markdown code block markers (```json, ```ts, or ```), allowing
-        # optional leading spaces and multiple blank lines after the fence.
-        content = re.sub(
-            r'^[ \t]*```(?:json|ts)?[ \t]*\n+',
-            '',
-            content,
-            flags=re.IGNORECASE | re.MULTILINE,
-        )
-        # Remove closing markdown code block markers (```), allowing optional
-        # leading newlines and trailing spaces.
-        content = re.sub(
-            r'\n*```[ \t]*$',
-            '',
-            content,
-            flags=re.MULTILINE,
-        )
+        content = _MD_OPEN_FENCE_RE.sub('', content)
+        content = _MD_CLOSE_FENCE_RE.sub('', content)
         content = content.strip()
 
     # First attempt: try to extract valid JSON if there are extra tokens
@@ -156,7 +157,7 @@ def repair_json_output(content: str) -> str:
             return content
         content = json.dumps(repaired_content, ensure_ascii=False)
     except Exception as e:
-        logger.debug(f"JSON repair failed: {e}")
+        logger.debug("JSON repair failed: %s", e)
 
     return content
 
@@ -184,7 +185,7 @@ def sanitize_tool_response(content: str, max_length: int = 50000) -> str:
     content = content.strip()
     
     # First, try to extract valid JSON to remove trailing tokens
-    if content.startswith('{') or content.startswith('['):
+    if content[:1] in _JSON_STARTS:
         content = _extract_json_from_content(content)
     
     # Truncate if too long to prevent token overflow
@@ -194,11 +195,9 @@ def sanitize_tool_response(content: str, max_length: int = 50000) -> str:
     
     # Remove common garbage patterns that appear from some models
     # These are often seen from quantized models with output corruption
-    garbage_patterns = [
-        r'[\x00-\x08\x0B-\x0C\x0E-\x1F\x7F-\x9F]',  # Control characters
-    ]
-    
-    for pattern in garbage_patterns:
-        content = re.sub(pattern, '', content)
+    if content.isascii():
+        content = content.translate(_CONTROL_CHARS_TABLE)
+    else:
+        content = _CONTROL_CHARS_RE.sub('', content)
     
     return content
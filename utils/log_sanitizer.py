@@ -11,11 +11,21 @@ logging to prevent attackers from forging log entries through:
 - Special character sequences that could be misinterpreted
 """
 
+import functools
 import re
-from typing import Any, Optional
+import string
+from typing import Any, Dict, List, Optional, Tuple
 
+# Control characters (ASCII 0-31) left after the escaped ones are replaced
+_CONTROL_CHARS_RE = re.compile(r"[\x00-\x08\x0b-\x0c\x0e-\x1f]")
 
-def sanitize_log_input(value: Any, max_length: int = 500) -> str:
+# Sequence types whose str() can be built from a slice when truncating
+_SEQUENCE_TYPES = (list, tuple)
+
+
+def sanitize_log_input(
+    value: Any, max_length: int = 500, pre_truncate: bool = False
+) -> str:
     """
     Sanitize user-controlled input for safe logging.
 
@@ -25,6 +35,9 @@ def sanitize_log_input(value: Any, max_length: int = 500) -> str:
     Args:
         value: The input value to sanitize (any type)
         max_length: Maximum length of output string (truncates if exceeded)
+        pre_truncate: Sanitize only the leading characters that can survive
+            truncation when that is enough to decide the result (for long
+            free-form text)
 
     Returns:
         str: Sanitized string safe for logging
@@ -50,26 +63,46 @@ def sanitize_log_input(value: Any, max_length: int = 500) -> str:
     if value is None:
         return "None"
 
-    # Convert to string
-    string_value = str(value)
-
-    # Replace dangerous characters with their escaped representations
-    # Order matters: escape backslashes first to avoid double-escaping
-    replacements = {
-        "\\": "\\\\",  # Backslash (must be first)
-        "\n": "\\n",   # Newline - prevents creating new log entries
-        "\r": "\\r",   # Carriage return
-        "\t": "\\t",   # Tab
-        "\x00": "\\0",  # Null character
-        "\x1b": "\\x1b",  # Escape character (used in ANSI sequences)
-    }
-
-    for char, replacement in replacements.items():
-        string_value = string_value.replace(char, replacement)
-
-    # Remove other control characters (ASCII 0-31 except those already handled)
-    # These are rarely useful in logs and could be exploited
-    string_value = re.sub(r"[\x00-\x08\x0b-\x0c\x0e-\x1f]", "", string_value)
+    # Convert to string (skipped when the value already is one). Long lists
+    # and tuples render only their first max_length + 1 items: that repr is
+    # a prefix of the full one and, from the brackets and separators alone,
+    # longer than max_length, so the truncated result is the same
+    value_type = type(value)
+    if value_type is str:
+        string_value = value
+    elif value_type in _SEQUENCE_TYPES and len(value) > max_length + 1:
+        string_value = str(value[: max_length + 1])
+    else:
+        string_value = str(value)
+
+    # Every character is kept, escaped or removed, so sanitizing a prefix
+    # gives a prefix of the full result. If the first max_length + 1
+    # characters already overflow max_length, the tail cannot change the
+    # truncated output. The inner limit is never hit (escapes are at most
+    # 4 characters long).
+    if pre_truncate and len(string_value) > max_length + 1:
+        head = sanitize_log_input(
+            string_value[: max_length + 1], max_length=4 * (max_length + 1)
+        )
+        if len(head) > max_length:
+            return head[: max_length - 3] + "..."
+
+    # Fast path: most values (IDs, names) have nothing to escape or remove.
+    # isprintable() is False for every control character, so only the
+    # backslash needs a separate check
+    if not string_value.isprintable() or "\\" in string_value:
+        # Replace dangerous characters with their escaped representations
+        # Order matters: escape backslashes first to avoid double-escaping
+        string_value = string_value.replace("\\", "\\\\")  # Backslash (must be first)
+        string_value = string_value.replace("\n", "\\n")  # Newline - prevents creating new log entries
+        string_value = string_value.replace("\r", "\\r")  # Carriage return
+        string_value = string_value.replace("\t", "\\t")  # Tab
+        string_value = string_value.replace("\x00", "\\0")  # Null character
+        string_value = string_value.replace("\x1b", "\\x1b")  # Escape character (used in ANSI sequences)
+
+        # Remove other control characters (ASCII 0-31 except those already handled)
+        # These are rarely useful in logs and could be exploited
+        string_value = _CONTROL_CHARS_RE.sub("", string_value)
 
     # Truncate if too long (prevent log flooding)
     if len(string_value) > max_length:
@@ -78,6 +111,12 @@ def sanitize_log_input(value: Any, max_length: int = 500) -> str:
     return string_value
 
 
+@functools.lru_cache(maxsize=4096)
+def _sanitize_identifier(value: str, max_length: int) -> str:
+    """Cached sanitize_log_input for the small, repeating set of IDs and names."""
+    return sanitize_log_input(value, max_length)
+
+
 def sanitize_thread_id(thread_id: Any) -> str:
     """
     Sanitize thread_id for logging.
@@ -91,6 +130,8 @@ def sanitize_thread_id(thread_id: Any) -> str:
     Returns:
         str: Sanitized thread ID
     """
+    if type(thread_id) is str:
+        return _sanitize_identifier(thread_id, 100)
     return sanitize_log_input(thread_id, max_length=100)
 
 
@@ -106,7 +147,7 @@ def sanitize_user_content(content: Any) -> str:
     Returns:
         str: Sanitized user content
     """
-    return sanitize_log_input(content, max_length=200)
+    return sanitize_log_input(content, max_length=200, pre_truncate=True)
 
 
 def sanitize_agent_name(agent_name: Any) -> str:
@@ -121,6 +162,8 @@ def sanitize_agent_name(agent_name: Any) -> str:
     Returns:
         str: Sanitized agent name
     """
+    if type(agent_name) is str:
+        return _sanitize_identifier(agent_name, 100)
     return sanitize_log_input(agent_name, max_length=100)
 
 
@@ -136,6 +179,8 @@ def sanitize_tool_name(tool_name: Any) -> str:
     Returns:
         str: Sanitized tool name
     """
+    if type(tool_name) is str:
+        return _sanitize_identifier(tool_name, 100)
     return sanitize_log_input(tool_name, max_length=100)
 
 
@@ -151,7 +196,71 @@ def sanitize_feedback(feedback: Any) -> str:
     Returns:
         str: Sanitized feedback (truncated more aggressively)
     """
-    return sanitize_log_input(feedback, max_length=150)
+    return sanitize_log_input(feedback, max_length=150, pre_truncate=True)
+
+
+def sanitize_batch(max_length: int = 500, **kwargs: Any) -> Dict[str, str]:
+    """
+    Sanitize several values for logging in one call.
+
+    Args:
+        max_length: Maximum length of each sanitized value
+        **kwargs: Values to sanitize, keyed by field name
+
+    Returns:
+        Dict[str, str]: Sanitized values under the same keys
+
+    Example:
+        >>> sanitize_batch(thread_id="abc\n", tool_name="search")
+        {'thread_id': 'abc\\n', 'tool_name': 'search'}
+    """
+    sanitize = sanitize_log_input
+    return {key: sanitize(value, max_length) for key, value in kwargs.items()}
+
+
+def sanitize_into(out: List[str], value: Any, max_length: int = 500) -> None:
+    """
+    Append a sanitized value to a list of message pieces.
+
+    Lets callers build a log message from several fields and join once.
+
+    Args:
+        out: List the sanitized value is appended to
+        value: The input value to sanitize (any type)
+        max_length: Maximum length of the sanitized value
+
+    Example:
+        >>> parts = ["tool="]
+        >>> sanitize_into(parts, "search\r")
+        >>> "".join(parts)
+        'tool=search\\r'
+    """
+    out.append(sanitize_log_input(value, max_length))
+
+
+@functools.lru_cache(maxsize=512)
+def _compile_template(template: str) -> Optional[Tuple[Tuple[str, Optional[str]], ...]]:
+    """
+    Split a template into (literal, field name) pairs for plain {key} fields.
+
+    Returns None when the template uses format specs, conversions, attribute
+    or index access, or positional fields, which are left to str.format.
+    """
+    parts = []
+    for literal, field, format_spec, conversion in string.Formatter().parse(template):
+        if field is not None and (
+            format_spec or conversion or not field.isidentifier()
+        ):
+            return None
+        parts.append((literal, field))
+    return tuple(parts)
+
+
+# Value types whose equal instances always have the same str(), so a message
+# built from them can be reused. float is left out because 0.0 == -0.0 but
+# they print differently. Longer strings are not worth keeping around
+_MEMOIZABLE_TYPES = frozenset({str, int, bool, type(None)})
+_MEMOIZABLE_STR_LENGTH = 256
 
 
 def create_safe_log_message(template: str, **kwargs) -> str:
@@ -177,10 +286,42 @@ def create_safe_log_message(template: str, **kwargs) -> str:
         >>> "[abc\\\\n[INFO]] Processing my_tool" in msg
         True
     """
-    # Sanitize all values
-    safe_kwargs = {
-        key: sanitize_log_input(value) for key, value in kwargs.items()
-    }
-
-    # Substitute into template
-    return template.format(**safe_kwargs)
+    key = []
+    for name, value in kwargs.items():
+        value_type = type(value)
+        if value_type not in _MEMOIZABLE_TYPES or (
+            value_type is str and len(value) > _MEMOIZABLE_STR_LENGTH
+        ):
+            return _build_safe_log_message(template, kwargs)
+        # The type is part of the key so that 1 and True stay distinct
+        key.append((name, value_type, value))
+    return _memoized_safe_log_message(template, tuple(key))
+
+
+@functools.lru_cache(maxsize=1024)
+def _memoized_safe_log_message(template: str, items: Tuple[Tuple[str, type, Any], ...]) -> str:
+    """Cached create_safe_log_message for messages built from plain values."""
+    return _build_safe_log_message(template, {name: value for name, _, value in items})
+
+
+def _build_safe_log_message(template: str, kwargs: Dict[str, Any]) -> str:
+    """Sanitize the values and substitute them into the template."""
+    parts = _compile_template(template)
+    if parts is None:
+        # Sanitize all values and let str.format resolve the fields
+        safe_kwargs = {
+            key: sanitize_log_input(value) for key, value in kwargs.items()
+        }
+        return template.format(**safe_kwargs)
+
+    # Sanitize only the values the template references, each once
+    safe_kwargs = {}
+    pieces = []
+    for literal, field in parts:
+        pieces.append(literal)
+        if field is not None:
+            safe_value = safe_kwargs.get(field)
+            if safe_value is None:
+                safe_value = safe_kwargs[field] = sanitize_log_input(kwargs[field])
+            pieces.append(safe_value)
+    return "".join(pieces)